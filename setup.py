@@ -13,6 +13,10 @@ setup(
         "gradio",
         "pytz",  # Required by gradio but missing from its dependencies
     ],
+    extras_require={
+        "fast": ["orjson"],  # Faster config/history JSON parsing
+        "async": ["aiohttp"],  # Async block uploads (many blocks in flight on one thread)
+    },
     entry_points={
         "console_scripts": [
             "yt-azure=yt_azure:main",
@@ -5,39 +5,128 @@ Cross-platform CLI tool (Windows, Linux, macOS)
 """
 
 import argparse
+import asyncio
+import atexit
+import base64
+import copy
+import functools
+import gzip
+import hashlib
+import importlib.util
 import json
 import logging
+import mmap
 import os
+import queue
+import re
+import shutil
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
+from urllib.parse import urlencode
 
-try:
-    import yt_dlp
-except ImportError:
-    print("Error: yt-dlp not installed. Run: pip install yt-dlp")
-    sys.exit(1)
+# Heavy dependencies are imported on first use so config commands start instantly
+_yt_dlp = None
+_azure_blob = None
+_gradio = None
 
-try:
-    from azure.storage.blob import BlobServiceClient
-except ImportError:
-    print("Error: azure-storage-blob not installed. Run: pip install azure-storage-blob")
-    sys.exit(1)
 
+def import_yt_dlp():
+    """Import yt-dlp on first use (raises ImportError with an install hint)"""
+    global _yt_dlp
+    if _yt_dlp is None:
+        try:
+            import yt_dlp
+        except ImportError as e:
+            raise ImportError("yt-dlp not installed. Run: pip install yt-dlp") from e
+        _yt_dlp = yt_dlp
+    return _yt_dlp
+
+
+def import_azure_blob():
+    """Import azure.storage.blob on first use (raises ImportError with an install hint)"""
+    global _azure_blob
+    if _azure_blob is None:
+        try:
+            import azure.storage.blob as azure_blob
+        except ImportError as e:
+            raise ImportError("azure-storage-blob not installed. Run: pip install azure-storage-blob") from e
+        _azure_blob = azure_blob
+    return _azure_blob
+
+
+def import_gradio():
+    """Import gradio on first use (returns None if not installed)"""
+    global _gradio
+    if _gradio is None:
+        try:
+            import gradio
+        except ImportError:
+            return None
+        _gradio = gradio
+    return _gradio
+
+# orjson is optional (pip install yt-azure[fast]); its errors subclass json.JSONDecodeError
 try:
-    import gradio as gr
-    HAS_GRADIO = True
+    import orjson
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+    def json_dumps(obj, indent=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
 except ImportError:
-    HAS_GRADIO = False
+    def json_loads(data):
+        return json.loads(data)
+
+    def json_dumps(obj, indent=False):
+        return json.dumps(obj, indent=2 if indent else None)
 
 SCRIPT_DIR = Path(__file__).parent.resolve()
 
+# Files kept next to the script (computed once)
+DEFAULT_CONFIG_PATH = SCRIPT_DIR / "yt-azure.json"
+HISTORY_PATH = SCRIPT_DIR / "history.jsonl"
+HISTORY_POSITION_PATH = SCRIPT_DIR / "history.pos"
+LEGACY_HISTORY_PATH = SCRIPT_DIR / "history.json"
+LOGS_PATH = SCRIPT_DIR / "yt-azure.log"
+
+# Matches the 11-char video ID in watch, embed, shorts and youtu.be URLs
+YOUTUBE_ID_RE = re.compile(
+    r"(?:youtu\.be/|youtube(?:-nocookie)?\.com/(?:watch\?(?:.*&)?v=|embed/|shorts/|v/|live/))([A-Za-z0-9_-]{11})"
+)
+
+# One component of a time string: "7", "07", "7.5" or ".5"
+TIME_PART_RE = re.compile(r"\d+(?:\.\d*)?|\.\d+", re.ASCII)
+
+# Log rotation: keep a few compressed backups of a size-capped log
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+# Upload tuning: blocks are staged in parallel, then committed as one blob
+UPLOAD_BLOCK_SIZE = 8 * 1024 * 1024
+UPLOAD_CONCURRENCY = 8
+UPLOAD_ASYNC_CONCURRENCY = 32
+
+# Azure clients reused across uploads (keeps the HTTP pipeline and connections warm)
+_service_clients = {}
+_container_clients = {}
+_clients_lock = threading.Lock()
+
+# Async clients live on one background event loop (they can't be shared across loops)
+_async_loop = None
+_async_service_clients = {}
+_async_container_clients = {}
+
 
 def get_config_path(custom_path=None):
     """Get config file path (defaults to same folder as script)"""
     if custom_path:
         return Path(custom_path)
-    return SCRIPT_DIR / "yt-azure.json"
+    return DEFAULT_CONFIG_PATH
 
 
 def resolve_path(path_str):
@@ -50,37 +139,37 @@ def resolve_path(path_str):
 
 def get_history_path():
     """Get history file path (same folder as script)"""
-    return SCRIPT_DIR / "history.json"
+    return HISTORY_PATH
+
 
+def get_history_position_path():
+    """Get history position file path (same folder as script)"""
+    return HISTORY_POSITION_PATH
 
+
+def get_legacy_history_path():
+    """Get pre-JSON-Lines history file path (migrated on first load)"""
+    return LEGACY_HISTORY_PATH
+
+
+@functools.lru_cache(maxsize=256)
 def parse_time(time_str):
     """Parse time string (MM:SS or HH:MM:SS or seconds) to seconds"""
     if not time_str:
         return None
     
-    time_str = str(time_str).strip()
-    
-    # Already a number
-    try:
-        return float(time_str)
-    except ValueError:
-        pass
-    
-    # Parse MM:SS or HH:MM:SS
-    parts = time_str.split(":")
-    try:
-        if len(parts) == 2:
-            minutes, seconds = map(float, parts)
-            return minutes * 60 + seconds
-        elif len(parts) == 3:
-            hours, minutes, seconds = map(float, parts)
-            return hours * 3600 + minutes * 60 + seconds
-    except ValueError:
-        pass
+    # Seconds, MM:SS or HH:MM:SS - validate each part instead of relying on exceptions
+    parts = [part.strip() for part in str(time_str).split(":")]
+    if len(parts) > 3 or not all(TIME_PART_RE.fullmatch(part) for part in parts):
+        return None
     
-    return None
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    return seconds
 
 
+@functools.lru_cache(maxsize=256)
 def format_time_for_filename(seconds):
     """Format seconds to MM-SS or HH-MM-SS for filename"""
     if seconds is None:
@@ -100,18 +189,42 @@ def format_time_for_filename(seconds):
 
 def get_logs_path():
     """Get logs file path (same folder as script)"""
-    return SCRIPT_DIR / "yt-azure.log"
+    return LOGS_PATH
+
+
+def gzip_log_name(name):
+    """Name rotated log files with a .gz suffix"""
+    return name + ".gz"
+
+
+def gzip_log_rotator(source, dest):
+    """Compress the rotated log file"""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
 
 
 def setup_logging():
     """Setup logging to file"""
     log_path = get_logs_path()
+    file_handler = RotatingFileHandler(
+        log_path,
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8",
+        delay=True
+    )
+    file_handler.namer = gzip_log_name
+    file_handler.rotator = gzip_log_rotator
+    # Console shows plain messages; only the log file gets timestamps and levels
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter("%(message)s"))
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s - %(levelname)s - %(message)s",
         handlers=[
-            logging.FileHandler(log_path),
-            logging.StreamHandler(sys.stdout)
+            file_handler,
+            console_handler
         ]
     )
     return logging.getLogger("yt-azure")
@@ -121,37 +234,234 @@ logger = setup_logging()
 
 
 def log(message, level="info"):
-    """Log message and print to console"""
+    """Log message (the stdout handler prints it to the console)"""
     getattr(logger, level)(message)
-    print(message)
 
 
-def load_history():
-    """Load download history"""
-    history_path = get_history_path()
-    if history_path.exists():
+def get_mtime(path):
+    """Get file modification time in ns, or None if the file doesn't exist"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=4)
+def _read_json_cached(path, mtime):
+    """Read and parse a JSON file (cached per path and mtime)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json_loads(f.read())
+
+
+def read_json(path):
+    """Read a JSON file, reusing the parsed result while its mtime is unchanged"""
+    mtime = get_mtime(path)
+    if mtime is None:
+        raise FileNotFoundError(path)
+    # Deep copy so callers that mutate the result don't poison the cache
+    return copy.deepcopy(_read_json_cached(str(path), mtime))
+
+
+# In-memory history entries, kept in sync with the append-only history file.
+# "downloads" maps download keys to the file each one produced; "display" holds
+# the dropdown choices as (label, index) pairs.
+_history_cache = {
+    "entries": None, "mtime": None, "position": None, "downloads": {}, "display": [], "migrated": False
+}
+
+# History file appends run on a background thread so UI handlers don't wait on disk.
+# The lock guards the cache and the files; the writer records the new mtime after
+# each append, so pending writes never look like an external change.
+_history_lock = threading.RLock()
+_migration_lock = threading.Lock()
+_history_queue = queue.Queue()
+_history_writer = None
+
+
+def history_writer():
+    """Apply queued history writes in order"""
+    while True:
+        write = _history_queue.get()
         try:
-            with open(history_path, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
-    return {"entries": [], "position": -1}
+            with _history_lock:
+                write()
+        except Exception as e:
+            logger.error(f"History write failed: {e}")
+        finally:
+            _history_queue.task_done()
+
+
+def queue_history_write(write):
+    """Queue a history file write, starting the writer thread on first use"""
+    global _history_writer
+    with _history_lock:
+        if _history_writer is None:
+            _history_writer = threading.Thread(target=history_writer, daemon=True)
+            _history_writer.start()
+    _history_queue.put(write)
+
+
+@atexit.register
+def flush_history_writes():
+    """Wait for queued history writes to reach disk"""
+    _history_queue.join()
+
+
+def format_history_item(index, entry):
+    """Format a history entry for the history dropdown"""
+    url = entry.get("url", "")
+    # Truncate URL for display
+    short_url = url[:40] + "..." if len(url) > 40 else url
+    time_info = ""
+    if entry.get("start") and entry.get("end"):
+        time_info = f" [{entry['start']}-{entry['end']}]"
+    return f"{index + 1}. {short_url}{time_info}"
+
+
+def set_history_cache(entries, mtime):
+    """Replace cached entries and rebuild everything derived from them"""
+    _history_cache["entries"] = entries
+    _history_cache["mtime"] = mtime
+    _history_cache["downloads"] = index_downloads(entries)
+    _history_cache["display"] = [(format_history_item(i, entry), i) for i, entry in enumerate(entries)]
+
+
+def download_key(url, start_time, end_time, format_str, precise=False, custom_name=None):
+    """Hash identifying a download (same URL, time range, format, cut mode and name produce the same file)"""
+    parts = [url.strip(), start_time, end_time, format_str]
+    # Frame-accurate cuts only change the file for partial downloads
+    if precise and start_time is not None and end_time is not None:
+        parts.append("precise")
+    # A custom name changes the output filename (and so the blob name)
+    if custom_name and custom_name.strip():
+        parts.append("name=" + custom_name.strip())
+    raw = "|".join(str(part) for part in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def index_downloads(entries):
+    """Map download keys to downloaded files (later entries win)"""
+    return {entry["key"]: entry["filepath"] for entry in entries if entry.get("key") and entry.get("filepath")}
+
+
+def find_downloaded_file(key):
+    """Get a previously downloaded file for this key if it's still on disk"""
+    try:
+        read_history_entries()
+    except IOError:
+        return None
+    filepath = _history_cache["downloads"].get(key)
+    if filepath and os.path.isfile(filepath) and os.path.getsize(filepath) > 0:
+        return filepath
+    return None
+
+
+def migrate_legacy_history():
+    """Convert history.json to history.jsonl + history.pos if needed (checked once per process)"""
+    if _history_cache["migrated"]:
+        return
+    # Other threads wait here until the migration has finished, so none reads history.jsonl early
+    with _migration_lock:
+        if _history_cache["migrated"]:
+            return
+        legacy_path = get_legacy_history_path()
+        if not get_history_path().exists() and legacy_path.exists():
+            try:
+                legacy = read_json(legacy_path)
+            except (json.JSONDecodeError, IOError):
+                legacy = None
+            if legacy is not None:
+                save_history(legacy)
+                legacy_path.rename(legacy_path.with_suffix(".json.bak"))
+        _history_cache["migrated"] = True
+
+
+def read_history_entries():
+    """Read history entries, reusing the in-memory copy while the file is unchanged"""
+    # Outside the lock: migrating saves history, which waits for the writer thread
+    migrate_legacy_history()
+    history_path = get_history_path()
+    with _history_lock:
+        mtime = get_mtime(history_path)
+        if _history_cache["entries"] is None or mtime != _history_cache["mtime"]:
+            entries = []
+            if mtime is not None:
+                with open(history_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            entries.append(json_loads(line))
+                        except json.JSONDecodeError:
+                            pass
+            set_history_cache(entries, mtime)
+        return _history_cache["entries"]
+
+
+def write_history_position(position):
+    """Write selected history position to disk"""
+    get_history_position_path().write_text(str(position))
+
+
+def save_history_position(position):
+    """Save selected history position"""
+    with _history_lock:
+        _history_cache["position"] = position
+        write_history_position(position)
+
+
+def load_history_entries():
+    """Load history entries without copying (callers must not modify the list)"""
+    try:
+        return read_history_entries()
+    except IOError:
+        return []
+
+
+def load_history_display():
+    """Load history dropdown choices (built once, extended on append)"""
+    load_history_entries()
+    return list(_history_cache["display"])
 
 
 def save_history(history):
-    """Save download history"""
+    """Save download history (rewrites the whole file)"""
+    # Let pending appends land first so they aren't written after the rewrite
+    flush_history_writes()
+    history_path = get_history_path()
+    with _history_lock:
+        with open(history_path, "w", encoding="utf-8") as f:
+            for entry in history["entries"]:
+                f.write(json_dumps(entry) + "\n")
+        save_history_position(history["position"])
+        set_history_cache(list(history["entries"]), get_mtime(history_path))
+
+
+def append_history_entry(entry):
+    """Append entry to the history file (runs on the writer thread, under the lock)"""
     history_path = get_history_path()
-    with open(history_path, "w") as f:
-        json.dump(history, f, indent=2)
+    with open(history_path, "a", encoding="utf-8") as f:
+        f.write(json_dumps(entry) + "\n")
+    _history_cache["mtime"] = get_mtime(history_path)
+    # Current position, not the one at queue time: a selection may have happened since
+    if _history_cache["position"] is not None:
+        write_history_position(_history_cache["position"])
 
 
 def add_to_history(entry):
-    """Add entry to history and save"""
-    history = load_history()
-    history["entries"].append(entry)
-    history["position"] = len(history["entries"]) - 1
-    save_history(history)
-    return history
+    """Add entry to the in-memory cache now and append it to the history file in the background"""
+    # Migrate before taking the lock (read_history_entries below would otherwise do it under the lock)
+    migrate_legacy_history()
+    with _history_lock:
+        entries = read_history_entries()
+        entries.append(entry)
+        position = len(entries) - 1
+        _history_cache["position"] = position
+        _history_cache["downloads"].update(index_downloads([entry]))
+        _history_cache["display"].append((format_history_item(position, entry), position))
+        queue_history_write(functools.partial(append_history_entry, entry))
+        return {"entries": list(entries), "position": position}
 
 
 def load_config(config_path=None):
@@ -172,13 +482,12 @@ def load_config(config_path=None):
     
     if config_file.exists():
         try:
-            with open(config_file, "r") as f:
-                saved_config = json.load(f)
-                # Merge with defaults
-                for key in default_config:
-                    if key in saved_config:
-                        default_config[key].update(saved_config[key])
-                return default_config
+            saved_config = read_json(config_file)
+            # Merge with defaults
+            for key in default_config:
+                if key in saved_config:
+                    default_config[key].update(saved_config[key])
+            return default_config
         except (json.JSONDecodeError, IOError) as e:
             print(f"Warning: Could not load config: {e}")
     
@@ -189,8 +498,16 @@ def save_config(config, config_path=None):
     """Save config to JSON file"""
     config_file = get_config_path(config_path)
     config_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(config_file, "w") as f:
-        json.dump(config, f, indent=2)
+    # Write to a temp file first so a failed write can't leave the config truncated
+    tmp_file = config_file.with_name(config_file.name + ".tmp")
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(json_dumps(config, indent=True))
+        os.replace(tmp_file, config_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+    _read_json_cached.cache_clear()
     print(f"\n✅ Config saved to: {config_file}")
 
 
@@ -247,19 +564,45 @@ def show_config(config_path=None):
     
     print(f"\n📄 Config file: {config_file}\n")
     
-    # Mask connection string
-    display_config = json.loads(json.dumps(config))
-    if display_config["azure"].get("connection_string"):
-        display_config["azure"]["connection_string"] = "*" * 20
+    # Mask connection string (copy only the azure section; nothing else is modified)
+    azure = config["azure"]
+    display_config = {
+        **config,
+        "azure": {**azure, "connection_string": "*" * 20 if azure.get("connection_string") else ""}
+    }
     
-    print(json.dumps(display_config, indent=2))
+    print(json_dumps(display_config, indent=True))
+
+
+def format_progress(d):
+    """Format a yt-dlp progress dict as a one-line status"""
+    total = d.get("total_bytes") or d.get("total_bytes_estimate")
+    downloaded = d.get("downloaded_bytes") or 0
+    percent = f"{downloaded / total * 100:.1f}%" if total else f"{downloaded / 1024 / 1024:.1f} MiB"
+    speed = d.get("speed")
+    speed_str = f" at {speed / 1024 / 1024:.2f} MiB/s" if speed else ""
+    return f"📥 Downloading: {percent}{speed_str}"
 
 
-def download_video(url, start_time=None, end_time=None, config=None, custom_name=None):
-    """Download video using yt-dlp"""
+def download_video(url, start_time=None, end_time=None, config=None, custom_name=None, progress_callback=None,
+                   force=False, precise=False):
+    """Download video using yt-dlp (progress_callback receives yt-dlp progress dicts)
+
+    Reuses the file from an earlier identical download in history unless force is set.
+    Time ranges are cut at keyframes and stream-copied unless precise is set, which
+    re-encodes around the cuts for frame-accurate (but much slower) results.
+    """
     if config is None:
         config = load_config()
 
+    if not force:
+        existing = find_downloaded_file(download_key(
+            url, start_time, end_time, config["download"]["format"], precise, custom_name
+        ))
+        if existing:
+            log(f"\n♻️  Already downloaded: {existing}")
+            return existing
+
     has_time_range = start_time is not None and end_time is not None
 
     # Resolve output path (handles relative paths cross-platform)
@@ -292,10 +635,11 @@ def download_video(url, start_time=None, end_time=None, config=None, custom_name
     
     # Add time range if specified
     if has_time_range:
-        ydl_opts["download_ranges"] = yt_dlp.utils.download_range_func(
+        ydl_opts["download_ranges"] = import_yt_dlp().utils.download_range_func(
             None, [(float(start_time), float(end_time))]
         )
-        ydl_opts["force_keyframes_at_cuts"] = True
+        # Without forced keyframes yt-dlp's ffmpeg downloader stream-copies the range
+        ydl_opts["force_keyframes_at_cuts"] = precise
     
     downloaded_file = None
     
@@ -303,6 +647,8 @@ def download_video(url, start_time=None, end_time=None, config=None, custom_name
         nonlocal downloaded_file
         if d["status"] == "finished":
             downloaded_file = d["filename"]
+        if progress_callback:
+            progress_callback(d)
     
     ydl_opts["progress_hooks"] = [progress_hook]
 
@@ -310,7 +656,7 @@ def download_video(url, start_time=None, end_time=None, config=None, custom_name
     if has_time_range:
         log(f"   Time range: {start_time}s - {end_time}s")
 
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+    with import_yt_dlp().YoutubeDL(ydl_opts) as ydl:
         ydl.download([url])
 
     if downloaded_file:
@@ -319,6 +665,183 @@ def download_video(url, start_time=None, end_time=None, config=None, custom_name
     return downloaded_file
 
 
+def get_container_client(connection_string, container_name):
+    """Get a cached Azure container client, creating it on first use"""
+    key = (connection_string, container_name)
+    # Locked so the UI warm-up thread and batch uploads don't build duplicate clients
+    with _clients_lock:
+        container_client = _container_clients.get(key)
+        if container_client is None:
+            service_client = _service_clients.get(connection_string)
+            if service_client is None:
+                service_client = import_azure_blob().BlobServiceClient.from_connection_string(
+                    connection_string,
+                    max_block_size=UPLOAD_BLOCK_SIZE,
+                    max_single_put_size=UPLOAD_BLOCK_SIZE
+                )
+                _service_clients[connection_string] = service_client
+            container_client = service_client.get_container_client(container_name)
+            _container_clients[key] = container_client
+    return container_client
+
+
+def has_async_azure():
+    """Check whether the async Azure transport (aiohttp) is installed"""
+    return importlib.util.find_spec("aiohttp") is not None
+
+
+def run_async(coro):
+    """Run a coroutine on the shared background event loop and wait for its result"""
+    global _async_loop
+    with _clients_lock:
+        if _async_loop is None:
+            _async_loop = asyncio.new_event_loop()
+            threading.Thread(target=_async_loop.run_forever, daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _async_loop).result()
+
+
+def get_async_container_client(connection_string, container_name):
+    """Get a cached async container client (only call from the background loop)"""
+    key = (connection_string, container_name)
+    container_client = _async_container_clients.get(key)
+    if container_client is None:
+        service_client = _async_service_clients.get(connection_string)
+        if service_client is None:
+            import_azure_blob()
+            from azure.storage.blob.aio import BlobServiceClient
+            service_client = BlobServiceClient.from_connection_string(
+                connection_string,
+                max_block_size=UPLOAD_BLOCK_SIZE,
+                max_single_put_size=UPLOAD_BLOCK_SIZE
+            )
+            _async_service_clients[connection_string] = service_client
+        container_client = service_client.get_container_client(container_name)
+        _async_container_clients[key] = container_client
+    return container_client
+
+
+async def warm_async_container_client(connection_string, container_name):
+    """Open a pooled connection for the async container client"""
+    await get_async_container_client(connection_string, container_name).get_container_properties()
+
+
+async def close_async_clients():
+    """Close cached async service clients (container clients share their transport)"""
+    for client in _async_service_clients.values():
+        try:
+            await client.close()
+        except Exception:
+            pass
+    _async_container_clients.clear()
+    _async_service_clients.clear()
+
+
+def warm_azure(config):
+    """Open a connection to the configured container ahead of the first upload"""
+    azure_config = config["azure"]
+    if not azure_config.get("connection_string") or not azure_config.get("container_name"):
+        return
+    try:
+        if has_async_azure():
+            run_async(warm_async_container_client(azure_config["connection_string"], azure_config["container_name"]))
+        else:
+            get_container_client(
+                azure_config["connection_string"],
+                azure_config["container_name"]
+            ).get_container_properties()
+    except Exception as e:
+        logger.warning(f"Azure warm-up failed: {e}")
+
+
+@atexit.register
+def close_azure_clients():
+    """Close cached Azure clients on exit"""
+    for client in list(_container_clients.values()) + list(_service_clients.values()):
+        try:
+            client.close()
+        except Exception:
+            pass
+    _container_clients.clear()
+    _service_clients.clear()
+    if _async_loop is not None and _async_service_clients:
+        try:
+            asyncio.run_coroutine_threadsafe(close_async_clients(), _async_loop).result(timeout=5)
+        except Exception:
+            pass
+
+
+def make_block_id(index):
+    """Build a fixed-width base64 block ID (Azure requires equal-length IDs)"""
+    return base64.b64encode(f"{index:08d}".encode()).decode()
+
+
+def stage_mapped_block(blob_client, mapped, block_id, offset):
+    """Stage one block, slicing it from the memory-mapped file in the worker thread"""
+    data = mapped[offset:offset + UPLOAD_BLOCK_SIZE]
+    blob_client.stage_block(block_id=block_id, data=data, length=len(data))
+
+
+def upload_blocks(blob_client, filepath):
+    """Stage file blocks in parallel and commit them as a single block blob"""
+    size = os.path.getsize(filepath)
+    if size == 0:
+        # mmap can't map an empty file
+        blob_client.upload_blob(b"", overwrite=True)
+        return
+
+    block_ids = [make_block_id(i) for i in range((size + UPLOAD_BLOCK_SIZE - 1) // UPLOAD_BLOCK_SIZE)]
+
+    # Workers slice blocks straight from the page cache, so at most one block per worker is in memory
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY) as executor:
+            futures = [
+                executor.submit(stage_mapped_block, blob_client, mapped, block_id, i * UPLOAD_BLOCK_SIZE)
+                for i, block_id in enumerate(block_ids)
+            ]
+            for future in futures:
+                future.result()
+
+    BlobBlock = import_azure_blob().BlobBlock
+    blob_client.commit_block_list([BlobBlock(block_id=block_id) for block_id in block_ids])
+
+
+async def upload_blocks_async(connection_string, container_name, blob_path, filepath):
+    """Stage file blocks concurrently on the event loop, commit them as a single block blob and return its URL"""
+    blob_client = get_async_container_client(connection_string, container_name).get_blob_client(blob_path)
+
+    size = os.path.getsize(filepath)
+    if size == 0:
+        # mmap can't map an empty file
+        await blob_client.upload_blob(b"", overwrite=True)
+        return blob_client.url
+
+    block_ids = [make_block_id(i) for i in range((size + UPLOAD_BLOCK_SIZE - 1) // UPLOAD_BLOCK_SIZE)]
+    semaphore = asyncio.Semaphore(UPLOAD_ASYNC_CONCURRENCY)
+
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        async def stage(block_id, offset):
+            async with semaphore:
+                data = mapped[offset:offset + UPLOAD_BLOCK_SIZE]
+                await blob_client.stage_block(block_id=block_id, data=data, length=len(data))
+
+        tasks = [
+            asyncio.ensure_future(stage(block_id, i * UPLOAD_BLOCK_SIZE))
+            for i, block_id in enumerate(block_ids)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the remaining blocks before the file is unmapped
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    BlobBlock = import_azure_blob().BlobBlock
+    await blob_client.commit_block_list([BlobBlock(block_id=block_id) for block_id in block_ids])
+    return blob_client.url
+
+
 def upload_to_azure(filepath, config=None):
     """Upload file to Azure Blob Storage"""
     if config is None:
@@ -334,34 +857,99 @@ def upload_to_azure(filepath, config=None):
         log("❌ Azure container name not configured. Run: yt-azure --config", "error")
         return None
     
-    blob_service_client = BlobServiceClient.from_connection_string(
-        azure_config["connection_string"]
-    )
-    container_client = blob_service_client.get_container_client(
-        azure_config["container_name"]
-    )
-    
     filename = os.path.basename(filepath)
     blob_folder = azure_config.get("blob_folder", "").strip("/")
     blob_path = f"{blob_folder}/{filename}" if blob_folder else filename
     
     log(f"\n☁️  Uploading to Azure: {azure_config['container_name']}/{blob_path}")
 
-    blob_client = container_client.get_blob_client(blob_path)
-
-    with open(filepath, "rb") as data:
-        blob_client.upload_blob(data, overwrite=True)
+    # Prefer async staging (many blocks in flight on one thread); fall back to the thread pool
+    if has_async_azure():
+        blob_url = run_async(upload_blocks_async(
+            azure_config["connection_string"],
+            azure_config["container_name"],
+            blob_path,
+            filepath
+        ))
+    else:
+        blob_client = get_container_client(
+            azure_config["connection_string"],
+            azure_config["container_name"]
+        ).get_blob_client(blob_path)
+        upload_blocks(blob_client, filepath)
+        blob_url = blob_client.url
 
     log(f"✅ Upload complete!")
-    log(f"   URL: {blob_client.url}")
+    log(f"   URL: {blob_url}")
     
-    return blob_client.url
+    return blob_url
+
+
+def read_urls_file(path):
+    """Read URLs from a text file (one per line, blank lines and # comments ignored)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+
+
+def batch_process(urls, config=None, workers=4, upload=True, start_time=None, end_time=None, force=False,
+                  precise=False):
+    """Download URLs in parallel, uploading each one as soon as its download finishes"""
+    if config is None:
+        config = load_config()
+
+    results = [{"url": url, "filepath": None, "blob_url": None, "error": None} for url in urls]
+
+    # Separate pools so uploads of finished videos overlap with downloads still running
+    with ThreadPoolExecutor(max_workers=workers) as download_pool, \
+            ThreadPoolExecutor(max_workers=workers) as upload_pool:
+        downloads = {
+            download_pool.submit(
+                download_video, result["url"], start_time, end_time, config, force=force, precise=precise
+            ): result
+            for result in results
+        }
+        uploads = {}
+
+        for future in as_completed(downloads):
+            result = downloads[future]
+            try:
+                result["filepath"] = future.result()
+            except Exception as e:
+                log(f"❌ Download error ({result['url']}): {e}", "error")
+                result["error"] = f"Download error: {e}"
+                continue
+            if not result["filepath"]:
+                result["error"] = "Download failed"
+            elif upload:
+                uploads[upload_pool.submit(upload_to_azure, result["filepath"], config)] = result
+
+        for future in as_completed(uploads):
+            result = uploads[future]
+            try:
+                result["blob_url"] = future.result()
+            except Exception as e:
+                log(f"❌ Upload error ({result['url']}): {e}", "error")
+                result["error"] = f"Upload error: {e}"
+                continue
+            if not result["blob_url"]:
+                result["error"] = "Upload failed - check Azure config"
+
+    return results
+
+
+def format_batch_result(result):
+    """Format a batch_process result as a one-line summary"""
+    if result["error"]:
+        return f"❌ {result['url']}: {result['error']}"
+    if result["blob_url"]:
+        return f"✅ {result['url']}: {result['blob_url']}"
+    return f"✅ {result['url']}: {result['filepath']}"
 
 
 def interactive_mode(config_path=None):
     """Run in interactive mode - Gradio UI if available, else text prompts"""
     
-    if HAS_GRADIO:
+    if import_gradio():
         launch_ui(config_path)
     else:
         text_interactive_mode(config_path)
@@ -407,41 +995,41 @@ def text_interactive_mode(config_path=None):
 def launch_ui(config_path=None):
     """Launch Gradio web UI"""
     
+    gr = import_gradio()
+    if gr is None:
+        print("Error: gradio not installed. Run: pip install gradio")
+        sys.exit(1)
+    
     config = load_config(config_path)
     
+    # Establish the Azure connection in the background so the first upload skips DNS/TLS setup
+    threading.Thread(target=warm_azure, args=(config,), daemon=True).start()
+    
     def get_youtube_embed_url(url, start_time, end_time):
         """Convert YouTube URL to embed URL with time parameters"""
         if not url:
             return ""
         
-        # Extract video ID
-        video_id = None
-        if "youtube.com/watch?v=" in url:
-            video_id = url.split("v=")[1].split("&")[0]
-        elif "youtu.be/" in url:
-            video_id = url.split("youtu.be/")[1].split("?")[0]
-        
-        if not video_id:
+        match = YOUTUBE_ID_RE.search(url)
+        if not match:
             return ""
         
         # Build embed URL with time parameters
-        embed_url = f"https://www.youtube.com/embed/{video_id}?"
-        params = []
+        params = {}
         
         start_sec = parse_time(start_time)
         end_sec = parse_time(end_time)
         
         if start_sec is not None:
-            params.append(f"start={int(start_sec)}")
+            params["start"] = int(start_sec)
         if end_sec is not None:
-            params.append(f"end={int(end_sec)}")
+            params["end"] = int(end_sec)
         
-        embed_url += "&".join(params)
-        return embed_url
+        return f"https://www.youtube.com/embed/{match.group(1)}?{urlencode(params)}"
     
-    def update_preview(url, start_time, end_time):
-        """Generate HTML for YouTube preview"""
-        embed_url = get_youtube_embed_url(url, start_time, end_time)
+    @functools.lru_cache(maxsize=64)
+    def render_preview(embed_url):
+        """Generate HTML for an embed URL (cached, the same URLs recur while typing)"""
         if not embed_url:
             return "<div style='height:450px;display:flex;align-items:center;justify-content:center;background:#f0f0f0;border-radius:8px;color:#666;'>Enter a YouTube URL to preview</div>"
         
@@ -455,45 +1043,39 @@ def launch_ui(config_path=None):
             style="border-radius:8px;">
         </iframe>'''
     
+    def update_preview(url, start_time, end_time):
+        """Generate HTML for YouTube preview"""
+        return render_preview(get_youtube_embed_url(url, start_time, end_time))
+    
+    def refresh_preview(url, start_time, end_time, last_embed_url):
+        """Update preview only when the embed URL actually changed"""
+        embed_url = get_youtube_embed_url(url, start_time, end_time)
+        if embed_url == last_embed_url:
+            return gr.update(), last_embed_url
+        return render_preview(embed_url), embed_url
+    
     def get_last_entry():
         """Get most recent history entry"""
-        h = load_history()
-        if h["entries"]:
-            return h["entries"][-1], len(h["entries"]) - 1
+        entries = load_history_entries()
+        if entries:
+            return entries[-1], len(entries) - 1
         return None, -1
     
     def get_history_list():
         """Get formatted history list for display"""
-        h = load_history()
-        items = []
-        for i, entry in enumerate(h["entries"]):
-            url = entry.get("url", "")
-            # Truncate URL for display
-            short_url = url[:40] + "..." if len(url) > 40 else url
-            time_info = ""
-            if entry.get("start") and entry.get("end"):
-                time_info = f" [{entry['start']}-{entry['end']}]"
-            items.append(f"{i+1}. {short_url}{time_info}")
-        return items
-    
-    def select_history_item(selected_value):
-        """Handle selection of history item from dropdown"""
+        return load_history_display()
+    
+    def select_history_item(idx):
+        """Handle selection of history item from dropdown (value is the entry index)"""
         empty_result = ("", "", "", "", "", "", "", True, update_preview("", "", ""), "")
 
-        if not selected_value:
-            return empty_result
-
-        h = load_history()
-        # Extract index from "1. url..." format
-        try:
-            idx = int(selected_value.split(".")[0]) - 1
-        except (ValueError, IndexError):
+        if idx is None:
             return empty_result
 
-        if 0 <= idx < len(h["entries"]):
-            h["position"] = idx
-            save_history(h)
-            entry = h["entries"][idx]
+        entries = load_history_entries()
+        if 0 <= idx < len(entries):
+            save_history_position(idx)
+            entry = entries[idx]
 
             url = entry.get("url", "")
             start = entry.get("start", "")
@@ -513,11 +1095,8 @@ def launch_ui(config_path=None):
             )
         return empty_result
     
-    def process(url, start_time, end_time, video_name, container, blob_folder, format_str, do_upload):
-        if not url:
-            return "❌ URL is required", gr.update(choices=get_history_list())
-
-        # Build config with overrides
+    def build_run_config(container, blob_folder, format_str):
+        """Build config with overrides from the form"""
         run_config = load_config(config_path)
         
         if container:
@@ -527,17 +1106,70 @@ def launch_ui(config_path=None):
         if format_str:
             run_config["download"]["format"] = format_str
         
+        return run_config
+    
+    def process_batch(batch_urls, container, blob_folder, format_str, do_upload, force):
+        """Download (and upload) every URL in the batch box in parallel"""
+        urls = [line.strip() for line in (batch_urls or "").splitlines() if line.strip()]
+        if not urls:
+            return "❌ Enter at least one URL", gr.update(choices=get_history_list())
+        
+        run_config = build_run_config(container, blob_folder, format_str)
+        results = batch_process(urls, run_config, upload=do_upload, force=force)
+        
+        for result in results:
+            add_to_history({
+                "url": result["url"],
+                "start": "",
+                "end": "",
+                "video_name": "",
+                "container": container,
+                "blob_folder": blob_folder,
+                "format": format_str,
+                "upload": do_upload,
+                "log": format_batch_result(result),
+                "filepath": result["filepath"],
+                "key": download_key(result["url"], None, None, run_config["download"]["format"]),
+                "timestamp": datetime.now().isoformat()
+            })
+        logger.info(f"Completed batch: {len(urls)} URLs")
+        
+        return "\n".join(format_batch_result(r) for r in results), gr.update(choices=get_history_list())
+    
+    def process(url, start_time, end_time, video_name, container, blob_folder, format_str, do_upload, force, precise):
+        if not url:
+            yield "❌ URL is required", gr.update(choices=get_history_list())
+            return
+
+        run_config = build_run_config(container, blob_folder, format_str)
+        
         # Parse times (supports MM:SS format)
         start = parse_time(start_time)
         end = parse_time(end_time)
         
         if (start is not None and end is None) or (start is None and end is not None):
-            return "❌ Both start and end time required for partial download", gr.update(choices=get_history_list())
+            yield "❌ Both start and end time required for partial download", gr.update(choices=get_history_list())
+            return
         
         output = []
         
+        # Download in a worker thread and stream its progress to the UI
+        progress = queue.Queue()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(download_video, url, start, end, run_config, video_name, progress.put, force, precise)
+            while not future.done():
+                try:
+                    d = progress.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                # Only the most recent update matters
+                while not progress.empty():
+                    d = progress.get_nowait()
+                if d["status"] == "downloading":
+                    yield format_progress(d), gr.update()
+        
         try:
-            filepath = download_video(url, start, end, run_config, video_name)
+            filepath = future.result()
             if not filepath:
                 output.append("❌ Download failed")
             else:
@@ -548,6 +1180,7 @@ def launch_ui(config_path=None):
             filepath = None
         
         if filepath and do_upload:
+            yield "\n".join(output + ["☁️  Uploading..."]), gr.update()
             try:
                 blob_url = upload_to_azure(filepath, run_config)
                 if blob_url:
@@ -569,12 +1202,15 @@ def launch_ui(config_path=None):
             "format": format_str,
             "upload": do_upload,
             "log": "\n".join(output),
+            "filepath": filepath,
+            "precise": precise,
+            "key": download_key(url, start, end, run_config["download"]["format"], precise, video_name),
             "timestamp": datetime.now().isoformat()
         }
         add_to_history(entry)
         logger.info(f"Completed: {url}, start={start_time}, end={end_time}")
         
-        return "\n".join(output), gr.update(choices=get_history_list())
+        yield "\n".join(output), gr.update(choices=get_history_list())
     
     # Load last entry for initial values
     last_entry, _ = get_last_entry()
@@ -650,14 +1286,31 @@ def launch_ui(config_path=None):
                 )
                 
                 upload_check = gr.Checkbox(label="Upload to Azure", value=initial_values["upload"])
+                force_check = gr.Checkbox(label="Force re-download", value=False)
+                precise_check = gr.Checkbox(
+                    label="Frame-accurate cuts",
+                    info="Re-encodes around start/end. Off: cuts at nearest keyframes without re-encoding (much faster)",
+                    value=False
+                )
                 
                 submit_btn = gr.Button("🚀 Download", variant="primary")
+                
+                with gr.Accordion("Batch", open=False):
+                    batch_input = gr.Textbox(
+                        label="URLs (one per line)",
+                        placeholder="Full videos, downloaded in parallel using the overrides above",
+                        lines=10
+                    )
+                    batch_btn = gr.Button("🚀 Download all")
             
             # Right pane - Video preview (70%)
             with gr.Column(scale=7):
                 preview_html = gr.HTML(
                     value=update_preview(initial_values["url"], initial_values["start"], initial_values["end"])
                 )
+                preview_state = gr.State(
+                    get_youtube_embed_url(initial_values["url"], initial_values["start"], initial_values["end"])
+                )
                 output = gr.Textbox(label="Output", lines=4, interactive=False)
         
         # Event handlers
@@ -665,17 +1318,24 @@ def launch_ui(config_path=None):
         
         history_list.change(fn=select_history_item, inputs=[history_list], outputs=form_fields + [preview_html, output])
         
-        # Update preview when URL or times change
+        # Update preview when URL or times change (only the latest pending keystroke is processed)
         gr.on(
             triggers=[url_input.change, start_input.change, end_input.change],
-            fn=update_preview,
-            inputs=[url_input, start_input, end_input],
-            outputs=[preview_html]
+            fn=refresh_preview,
+            inputs=[url_input, start_input, end_input, preview_state],
+            outputs=[preview_html, preview_state],
+            trigger_mode="always_last"
         )
         
         submit_btn.click(
             fn=process,
-            inputs=[url_input, start_input, end_input, video_name_input, container_input, folder_input, format_input, upload_check],
+            inputs=[url_input, start_input, end_input, video_name_input, container_input, folder_input, format_input, upload_check, force_check, precise_check],
+            outputs=[output, history_list]
+        )
+        
+        batch_btn.click(
+            fn=process_batch,
+            inputs=[batch_input, container_input, folder_input, format_input, upload_check, force_check],
             outputs=[output, history_list]
         )
     
@@ -693,6 +1353,7 @@ Examples:
   yt-azure --url "https://..." --start 3:07 --end 3:21
   yt-azure --url "https://..." --start 0 --end 30
   yt-azure --url "https://..." --container my-container --blob-folder videos/
+  yt-azure --urls-file urls.txt --workers 4   # Batch download (one URL per line)
   yt-azure --config                           # Configure settings (default location)
   yt-azure --config /path/to/config.json      # Configure at custom location
   yt-azure --show-config                      # Show current config
@@ -700,6 +1361,8 @@ Examples:
     )
     
     parser.add_argument("--url", "-u", help="YouTube video URL")
+    parser.add_argument("--urls-file", help="Text file with one URL per line (batch mode)")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel downloads/uploads in batch mode (default: 4)")
     parser.add_argument("--start", "-s", help="Start time (seconds or MM:SS)")
     parser.add_argument("--end", "-e", help="End time (seconds or MM:SS)")
     parser.add_argument("--config", "-c", nargs="?", const=True, help="Configure settings (optionally specify config file path)")
@@ -709,6 +1372,8 @@ Examples:
     parser.add_argument("--blob-folder", help="Azure blob folder (overrides config)")
     parser.add_argument("--format", "-f", help="Video format (overrides config)")
     parser.add_argument("--no-upload", action="store_true", help="Skip Azure upload")
+    parser.add_argument("--force", action="store_true", help="Download again even if history has the file")
+    parser.add_argument("--precise", action="store_true", help="Frame-accurate time range cuts (re-encodes, much slower)")
     
     args = parser.parse_args()
     
@@ -728,12 +1393,21 @@ Examples:
         show_config(config_path)
         return
     
-    # If no URL provided, run interactive mode
-    if not args.url:
-        interactive_mode(config_path)
-        return
-    
-    # CLI mode with arguments
+    # Missing yt-dlp/azure-storage-blob surface here (they're imported lazily);
+    # inside the UI the handlers report them instead of exiting
+    try:
+        # If no URL provided, run interactive mode
+        if not args.url and not args.urls_file:
+            interactive_mode(config_path)
+        else:
+            run_cli(args, config_path)
+    except ImportError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+def run_cli(args, config_path=None):
+    """CLI mode with arguments"""
     config = load_config(config_path)
     
     # Apply CLI overrides
@@ -748,10 +1422,41 @@ Examples:
     start_time = parse_time(args.start)
     end_time = parse_time(args.end)
     
-    filepath = download_video(args.url, start_time, end_time, config)
+    def record_cli_download(url, filepath, log_text):
+        """Record a CLI download in history so later runs (CLI or UI) can reuse the file"""
+        add_to_history({
+            "url": url,
+            "start": args.start or "",
+            "end": args.end or "",
+            "container": args.container or "",
+            "blob_folder": args.blob_folder or "",
+            "format": args.format or "",
+            "upload": not args.no_upload,
+            "log": log_text,
+            "filepath": filepath,
+            "precise": args.precise,
+            "key": download_key(url, start_time, end_time, config["download"]["format"], args.precise),
+            "timestamp": datetime.now().isoformat()
+        })
+    
+    if args.urls_file:
+        urls = read_urls_file(args.urls_file)
+        if args.url:
+            urls.insert(0, args.url)
+        results = batch_process(urls, config, args.workers, not args.no_upload, start_time, end_time, args.force, args.precise)
+        log("\n📋 Batch summary:")
+        for result in results:
+            log(f"   {format_batch_result(result)}")
+            record_cli_download(result["url"], result["filepath"], format_batch_result(result))
+        return
+    
+    filepath = download_video(args.url, start_time, end_time, config, force=args.force, precise=args.precise)
     
     if filepath and not args.no_upload:
         upload_to_azure(filepath, config)
+    
+    if filepath:
+        record_cli_download(args.url, filepath, f"✅ Downloaded: {filepath}")
 
 
 if __name__ == "__main__":